@@ -3,9 +3,13 @@ Main Web Search Agent Application
 Combines web search and AI summarization
 """
 import os
+from typing import Optional
 from dotenv import load_dotenv
-from web_search_duckduckgo import WebSearcher
+from search_registry import SearchRegistry
+from query_expansion import QueryExpander
 from groq_ai import GroqAI
+from deadline import (Deadline, SummaryCache, resolve_deadline, filter_with_fallback,
+                      summarize_with_fallback, SEARCH_SHARE)
 
 
 class WebSearchAgent:
@@ -23,14 +27,19 @@ class WebSearchAgent:
             raise ValueError("GROQ_API_KEY not found in environment variables")
         
         # Initialize components
-        self.searcher = WebSearcher()  # No API key needed for DuckDuckGo
+        self.searcher = SearchRegistry()  # Backends configured via SEARCH_BACKENDS
         self.ai = GroqAI(groq_api_key)
+        # QUERY_EXPANSION=llm uses a small model instead of local heuristics
+        use_llm = os.getenv('QUERY_EXPANSION', 'heuristic').lower() == 'llm'
+        self.expander = QueryExpander(self.searcher, self.ai if use_llm else None)
+        self.summary_cache = SummaryCache()
         
         print("✓ Web Search Agent initialized successfully!")
-        print("✓ Using DuckDuckGo for web search (no API key required)")
+        print(f"✓ Search backends: {', '.join(self.searcher.order)}")
     
     def search_and_summarize(self, query: str, num_results: int = 10, 
-                           filter_results: bool = True) -> dict:
+                           filter_results: bool = True, expand_query: bool = False,
+                           deadline: Optional[float] = None) -> dict:
         """
         Perform a web search and get AI-powered summary
         
@@ -38,41 +47,58 @@ class WebSearchAgent:
             query: User's search query
             num_results: Number of search results to retrieve
             filter_results: Whether to use AI to filter most relevant results
+            expand_query: Whether to split the query into parallel sub-searches
+            deadline: Seconds allowed end to end (default: REQUEST_DEADLINE_SECONDS).
+                Stages that would overrun it are skipped or degraded.
             
         Returns:
-            Dictionary containing search results and AI summary
+            Dictionary containing search results, AI summary and the
+            list of 'degraded' steps applied to meet the deadline
         """
+        deadline = Deadline(resolve_deadline(deadline))
+        degradations = []
+        
         print(f"\n🔍 Searching for: '{query}'")
         print("=" * 60)
         
         # Step 1: Perform web search
         print("\n[1/3] Fetching search results...")
-        raw_results = self.searcher.search(query, num_results)
-        search_results = self.searcher.format_results(raw_results)
+        searcher = self.expander if expand_query else self.searcher
+        raw_results = searcher.search(query, num_results,
+                                      timeout=deadline.budget(SEARCH_SHARE))
+        search_results = searcher.format_results(raw_results)
         
         if not search_results or 'error' in raw_results:
             return {
                 'query': query,
                 'error': 'Failed to fetch search results',
                 'results': [],
-                'summary': 'No results available due to search error.'
+                'summary': 'No results available due to search error.',
+                'degraded': degradations
             }
         
-        print(f"      Found {len(search_results)} results")
+        if expand_query:
+            print(f"      Found {len(search_results)} results from {len(raw_results['sub_queries'])} sub-queries")
+        else:
+            print(f"      Found {len(search_results)} results via {raw_results['backend']}")
         
         # Step 2: Filter results using AI (optional)
         filtered_results = search_results
         if filter_results and len(search_results) > 5:
             print("\n[2/3] Filtering most relevant results with AI...")
-            filtered_results = self.ai.filter_relevant_results(query, search_results, top_n=5)
+            filtered_results = filter_with_fallback(self.ai, query, search_results,
+                                                    deadline, degradations)
             print(f"      Selected {len(filtered_results)} most relevant results")
         else:
             print("\n[2/3] Using all results (no filtering)")
         
         # Step 3: Generate AI summary
         print("\n[3/3] Generating AI-powered summary...")
-        summary = self.ai.summarize_results(query, filtered_results)
+        summary = summarize_with_fallback(self.ai, query, filtered_results, deadline,
+                                          self.summary_cache, degradations)
         
+        if degradations:
+            print(f"\n⚠ Degraded to meet the deadline: {', '.join(degradations)}")
         print("\n✓ Processing complete!")
         
         return {
@@ -80,7 +106,10 @@ class WebSearchAgent:
             'num_results': len(search_results),
             'filtered_results': filtered_results,
             'all_results': search_results,
-            'summary': summary
+            'summary': summary,
+            'backend': raw_results.get('backend'),
+            'sub_queries': raw_results.get('sub_queries', [query]),
+            'degraded': degradations
         }
     
     def interactive_mode(self):
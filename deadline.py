@@ -0,0 +1,209 @@
+"""
+End-to-end request deadlines with per-stage budgets and graceful degradation
+"""
+import os
+import re
+import math
+import time
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional
+
+
+# Share of the remaining time each stage may use
+SEARCH_SHARE = 0.4
+FILTER_SHARE = 0.25
+
+# Below these many seconds a stage is skipped instead of attempted
+MIN_FILTER_SECONDS = 2.0
+MIN_SUMMARY_SECONDS = 2.0
+
+SOURCES_ONLY_MESSAGE = "Summary unavailable within the time limit. See the sources below."
+
+
+def resolve_deadline(requested: Optional[float] = None) -> float:
+    """
+    Turn a client-requested deadline into the one the server will honour
+
+    Args:
+        requested: Seconds asked for by the client, or None for the default
+
+    Returns:
+        Deadline in seconds, capped at MAX_REQUEST_DEADLINE_SECONDS
+
+    Raises:
+        ValueError: If the value is a boolean, NaN or infinite
+        TypeError: If the value is not a number
+    """
+    default = float(os.getenv('REQUEST_DEADLINE_SECONDS', '20'))
+    cap = float(os.getenv('MAX_REQUEST_DEADLINE_SECONDS', '30'))
+
+    if requested is None:
+        return min(default, cap)
+
+    # JSON true/false would otherwise pass as 1/0 seconds
+    if isinstance(requested, bool):
+        raise ValueError("deadline must be a number of seconds")
+    requested = float(requested)
+    if not math.isfinite(requested):
+        raise ValueError("deadline must be a number of seconds")
+
+    if requested <= 0:
+        requested = default
+    return min(requested, cap)
+
+
+class Deadline:
+    """Wall-clock deadline shared by all stages of one request"""
+
+    def __init__(self, seconds: float):
+        """
+        Start the deadline clock
+
+        Args:
+            seconds: Total time allowed for the request
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Return True once the deadline has passed"""
+        return self.remaining() <= 0
+
+    def budget(self, share: float) -> float:
+        """Seconds a stage may use, as a share of the remaining time"""
+        return self.remaining() * share
+
+
+class SummaryCache:
+    """Small thread-safe LRU cache of successful summaries keyed by query"""
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of summaries kept
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(query: str) -> str:
+        """Normalize case and whitespace so equivalent queries share an entry"""
+        return ' '.join(query.lower().split())
+
+    def get(self, query: str) -> Optional[str]:
+        """Return the cached summary for a query, if any"""
+        key = self._key(query)
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, query: str, summary: str):
+        """Store a summary, evicting the least recently used entry if full"""
+        key = self._key(query)
+        with self._lock:
+            self._entries[key] = summary
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def extractive_summary(query: str, search_results: List[Dict[str, str]],
+                       max_sources: int = 5) -> str:
+    """
+    Build a summary from the first sentence of each snippet, without AI
+
+    Args:
+        query: Original user query
+        search_results: List of search results
+        max_sources: Number of results to draw sentences from
+
+    Returns:
+        Summary text citing sources by number
+    """
+    lines = [f'Key points from the top sources for "{query}":', ""]
+
+    for i, result in enumerate(search_results[:max_sources], 1):
+        snippet = result.get('snippet', '').strip()
+        if not snippet:
+            continue
+        sentence = re.split(r'(?<=[.!?])\s+', snippet)[0]
+        lines.append(f"- {sentence} [{i}]")
+
+    return "\n".join(lines)
+
+
+def filter_with_fallback(ai, query: str, search_results: List[Dict[str, str]],
+                         deadline: Deadline, degradations: List[str],
+                         top_n: int = 5) -> List[Dict[str, str]]:
+    """
+    Filter results with AI within the deadline, keeping the top results otherwise
+
+    Args:
+        ai: GroqAI instance
+        query: Original user query
+        search_results: Results to filter
+        deadline: Request deadline
+        degradations: List that applied degradations are appended to
+        top_n: Number of results to keep
+
+    Returns:
+        Filtered list of results
+    """
+    if deadline.remaining() >= MIN_FILTER_SECONDS:
+        try:
+            return ai.rank_results(query, search_results, top_n=top_n,
+                                   timeout=deadline.budget(FILTER_SHARE))
+        except Exception as e:
+            print(f"Filter error: {e}")
+
+    degradations.append('skipped_filtering')
+    return search_results[:top_n]
+
+
+def summarize_with_fallback(ai, query: str, search_results: List[Dict[str, str]],
+                            deadline: Deadline, cache: SummaryCache,
+                            degradations: List[str]) -> str:
+    """
+    Summarize within the deadline, degrading to cached, extractive or no summary
+
+    Args:
+        ai: GroqAI instance
+        query: Original user query
+        search_results: Results to summarize
+        deadline: Request deadline
+        cache: Cache of earlier successful summaries
+        degradations: List that applied degradations are appended to
+
+    Returns:
+        Summary text
+    """
+    if deadline.remaining() >= MIN_SUMMARY_SECONDS:
+        try:
+            summary = ai.generate_summary(query, search_results,
+                                          timeout=deadline.remaining())
+            cache.put(query, summary)
+            return summary
+        except Exception as e:
+            print(f"Summary error: {e}")
+
+    cached = cache.get(query)
+    if cached:
+        degradations.append('cached_summary')
+        return cached
+
+    if deadline.expired():
+        degradations.append('sources_only')
+        return SOURCES_ONLY_MESSAGE
+
+    degradations.append('extractive_summary')
+    return extractive_summary(query, search_results)
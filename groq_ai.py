@@ -2,30 +2,65 @@
 Groq AI module for processing and summarizing search results
 """
 from groq import Groq
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 
 class GroqAI:
     """Handles AI operations using Groq API"""
     
-    def __init__(self, api_key: str, model: str = "llama-3.3-70b-versatile"):
+    def __init__(self, api_key: str, model: str = "llama-3.3-70b-versatile",
+                 timeout: float = 30.0):
         """
         Initialize the GroqAI client
         
         Args:
             api_key: Groq API key
             model: Model to use (default: llama-3.1-70b-versatile)
+            timeout: Default request timeout in seconds (default: 30)
         """
-        self.client = Groq(api_key=api_key)
+        self.client = Groq(api_key=api_key, timeout=timeout)
         self.model = model
+        self.timeout = timeout
     
-    def summarize_results(self, query: str, search_results: List[Dict[str, str]]) -> str:
+    def _client_for(self, timeout: Optional[float]):
+        """
+        Return the client to use for one call
+        
+        Calls with an explicit timeout get a single attempt, because the SDK
+        applies the timeout per retry and would otherwise overrun the deadline.
+        """
+        if timeout is None:
+            return self.client
+        return self.client.with_options(max_retries=0, timeout=timeout)
+    
+    def summarize_results(self, query: str, search_results: List[Dict[str, str]],
+                          timeout: Optional[float] = None) -> str:
         """
         Summarize and filter search results using AI
         
         Args:
             query: Original user query
             search_results: List of search results to process
+            timeout: Request timeout in seconds (default: client timeout)
+            
+        Returns:
+            AI-generated summary and analysis
+        """
+        try:
+            return self.generate_summary(query, search_results, timeout)
+        
+        except Exception as e:
+            return f"Error generating summary: {str(e)}"
+    
+    def generate_summary(self, query: str, search_results: List[Dict[str, str]],
+                         timeout: Optional[float] = None) -> str:
+        """
+        Generate an AI summary, raising on API errors or timeouts
+        
+        Args:
+            query: Original user query
+            search_results: List of search results to process
+            timeout: Request timeout in seconds (default: client timeout)
             
         Returns:
             AI-generated summary and analysis
@@ -50,28 +85,24 @@ Please provide a comprehensive, well-organized summary that:
 
 Keep the response clear, concise, and informative."""
 
-        try:
-            # Call Groq API
-            chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert research assistant who excels at analyzing and summarizing information from multiple sources."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model=self.model,
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            return chat_completion.choices[0].message.content
+        # Call Groq API
+        chat_completion = self._client_for(timeout).chat.completions.create(
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert research assistant who excels at analyzing and summarizing information from multiple sources."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            model=self.model,
+            temperature=0.7,
+            max_tokens=2000
+        )
         
-        except Exception as e:
-            return f"Error generating summary: {str(e)}"
+        return chat_completion.choices[0].message.content
     
     def _format_results_for_prompt(self, search_results: List[Dict[str, str]]) -> str:
         """
@@ -94,7 +125,7 @@ Keep the response clear, concise, and informative."""
         return "\n".join(formatted)
     
     def filter_relevant_results(self, query: str, search_results: List[Dict[str, str]], 
-                               top_n: int = 5) -> List[Dict[str, str]]:
+                               top_n: int = 5, timeout: Optional[float] = None) -> List[Dict[str, str]]:
         """
         Use AI to filter and rank the most relevant search results
         
@@ -102,6 +133,28 @@ Keep the response clear, concise, and informative."""
             query: Original user query
             search_results: List of search results
             top_n: Number of top results to return
+            timeout: Request timeout in seconds (default: client timeout)
+            
+        Returns:
+            Filtered list of most relevant results
+        """
+        try:
+            return self.rank_results(query, search_results, top_n, timeout)
+        
+        except Exception as e:
+            # If filtering fails, return top N results
+            return search_results[:top_n]
+    
+    def rank_results(self, query: str, search_results: List[Dict[str, str]],
+                     top_n: int = 5, timeout: Optional[float] = None) -> List[Dict[str, str]]:
+        """
+        Pick the most relevant results with AI, raising on API errors or timeouts
+        
+        Args:
+            query: Original user query
+            search_results: List of search results
+            top_n: Number of top results to return
+            timeout: Request timeout in seconds (default: client timeout)
             
         Returns:
             Filtered list of most relevant results
@@ -119,26 +172,65 @@ And these search results:
 Please identify the {top_n} most relevant result numbers (just the numbers) that best answer the query.
 Respond with only the numbers separated by commas, like: 1,3,5,7,9"""
 
+        chat_completion = self._client_for(timeout).chat.completions.create(
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            model=self.model,
+            temperature=0.3,
+            max_tokens=50
+        )
+        
+        # Parse the response to get result indices
+        response = chat_completion.choices[0].message.content.strip()
+        indices = [int(x.strip()) - 1 for x in response.split(',') if x.strip().isdigit()]
+        filtered = [search_results[i] for i in indices if 0 <= i < len(search_results)]
+        
+        if not filtered:
+            raise ValueError(f"Could not parse result ranking: {response!r}")
+        return filtered
+    
+    def generate_sub_queries(self, query: str, max_queries: int = 3,
+                             model: str = "llama-3.1-8b-instant",
+                             timeout: Optional[float] = None) -> List[str]:
+        """
+        Use a small model to decompose a query into focused sub-queries
+        
+        Args:
+            query: Original user query
+            max_queries: Maximum number of sub-queries to return
+            model: Model to use (default: llama-3.1-8b-instant)
+            timeout: Request timeout in seconds (default: client timeout)
+            
+        Returns:
+            List of sub-queries (empty if the call fails)
+        """
+        prompt = f"""Break the following search query into at most {max_queries} short, self-contained web search queries that together cover all of its facets.
+
+Query: "{query}"
+
+Respond with one search query per line and nothing else."""
+
         try:
-            chat_completion = self.client.chat.completions.create(
+            chat_completion = self._client_for(timeout).chat.completions.create(
                 messages=[
                     {
                         "role": "user",
                         "content": prompt
                     }
                 ],
-                model=self.model,
+                model=model,
                 temperature=0.3,
-                max_tokens=50
+                max_tokens=150
             )
             
-            # Parse the response to get result indices
             response = chat_completion.choices[0].message.content.strip()
-            indices = [int(x.strip()) - 1 for x in response.split(',') if x.strip().isdigit()]
-            
-            # Return filtered results
-            return [search_results[i] for i in indices if 0 <= i < len(search_results)]
+            lines = [line.strip().lstrip('-*0123456789. ').strip('"') for line in response.splitlines()]
+            return [line for line in lines if line][:max_queries]
         
         except Exception as e:
-            # If filtering fails, return top N results
-            return search_results[:top_n]
+            # If expansion fails, search the original query only
+            return []
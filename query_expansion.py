@@ -0,0 +1,346 @@
+"""
+Multi-query expansion with parallel sub-searches and reciprocal rank fusion
+"""
+import os
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Optional
+
+
+# Words that carry no facet on their own
+STOPWORDS = {
+    'a', 'an', 'the', 'what', 'which', 'who', 'whom', 'when', 'where', 'why',
+    'how', 'is', 'are', 'was', 'were', 'do', 'does', 'did', 'can', 'could',
+    'should', 'would', 'will', 'of', 'in', 'on', 'for', 'to', 'about', 'me',
+    'tell', 'explain', 'please', 'i', 'you', 'it', 'its', 'there', 'and',
+    'or', 'with', 'vs', 'versus', 'compared', 'between'
+}
+
+# Separators between the things being compared ("A vs B")
+COMPARE_SPLIT = re.compile(r'\s*(?:\bvs\b\.?|\bversus\b|\bcompared (?:to|with)\b)\s*',
+                           re.IGNORECASE)
+
+# Separators between coordinated items ("A and B", "A, B")
+CONJUNCTION_SPLIT = re.compile(r'\s*(?:[,;]|\band\b)\s*', re.IGNORECASE)
+
+# Any facet separator
+FACET_SPLIT = re.compile(r'\s*(?:[,;]|\band\b|\bvs\b\.?|\bversus\b|\bcompared (?:to|with)\b)\s*',
+                         re.IGNORECASE)
+
+# Words that attach shared context to each item ("restaurants in X and Y")
+PREPOSITIONS = {
+    'in', 'on', 'for', 'of', 'to', 'at', 'from', 'by', 'about', 'as', 'with',
+    'during', 'under', 'near', 'into', 'across', 'among', 'between'
+}
+
+# Context words that relate the items to each other, so they cannot be split
+RELATIONAL = {
+    'between', 'difference', 'differences', 'relationship', 'both', 'compare',
+    'comparison', 'versus', 'vs'
+}
+
+# Coordinated items longer than this are treated as clauses, not parallel items
+MAX_ITEM_WORDS = 3
+
+
+def _split_words(pattern: re.Pattern, text: str) -> List[List[str]]:
+    """Split text on a separator pattern into non-empty lists of words"""
+    parts = [re.findall(r"[\w'.+#-]+", part) for part in pattern.split(text)]
+    return [part for part in parts if part]
+
+
+def _distribute_context(parts: List[List[str]]) -> List[List[str]]:
+    """
+    Give every coordinated item the context written only once in the query
+
+    The longer of the first/last segment holds the shared context, joined to
+    its own item by a preposition: "AI rules in EU and US" -> "AI rules in
+    EU", "AI rules in US"; "cats and dogs as pets" -> "cats as pets", "dogs
+    as pets". Segments that are not clearly parallel (long clauses, no
+    preposition boundary, or context such as "difference between") yield
+    nothing rather than a broken sub-query.
+
+    Args:
+        parts: Segments of the query, as word lists
+
+    Returns:
+        One word list per facet (empty if the segments are not parallel)
+    """
+    if len(parts) < 2:
+        return []
+
+    items_lead = len(parts[0]) < len(parts[-1])
+    anchor = parts[-1] if items_lead else parts[0]
+    items = parts[:-1] if items_lead else parts[1:]
+    if any(len(item) > MAX_ITEM_WORDS for item in items):
+        return []
+
+    boundaries = [i for i, w in enumerate(anchor) if w.lower() in PREPOSITIONS]
+    if items_lead:
+        # "dogs as pets": the item ends at the first preposition
+        if not boundaries or boundaries[0] == 0:
+            return []
+        anchor_item, context = anchor[:boundaries[0]], anchor[boundaries[0]:]
+    else:
+        # "AI rules in EU": the item starts after the last preposition
+        if not boundaries or boundaries[-1] == len(anchor) - 1:
+            return []
+        context, anchor_item = anchor[:boundaries[-1] + 1], anchor[boundaries[-1] + 1:]
+
+    if len(anchor_item) > MAX_ITEM_WORDS or any(w.lower() in RELATIONAL for w in context):
+        return []
+
+    if items_lead:
+        return [item + context for item in items + [anchor_item]]
+    return [context + item for item in [anchor_item] + items]
+
+
+def _split_comparison(parts: List[List[str]], limit: int) -> List[List[str]]:
+    """
+    Expand "A vs B <aspects>" into one facet per subject (and aspect)
+
+    Args:
+        parts: Segments split on comparison separators, subjects first
+        limit: Maximum number of facets to return
+
+    Returns:
+        One word list per facet (empty if the comparison cannot be split)
+    """
+    head, last = parts[:-1], parts[-1]
+    if any(len(s) > MAX_ITEM_WORDS for s in head):
+        return []
+
+    # The last subject is as long as the others unless that would cut into
+    # a phrase ("London cost | of living"), in which case it is shorter
+    size = min(max(len(s) for s in head), len(last))
+    while size > 1 and last[size:] and last[size].lower() in STOPWORDS | PREPOSITIONS:
+        size -= 1
+    subjects = head + [last[:size]]
+    rest = last[size:]
+
+    if any(w.lower() in STOPWORDS for s in subjects for w in s):
+        return []
+    if len(subjects) > limit:
+        return []
+
+    aspects = _split_words(CONJUNCTION_SPLIT, ' '.join(rest)) or [[]]
+    if len(subjects) * len(aspects) > limit:
+        # Too many combinations: give every subject the whole aspect text
+        # instead of covering some pairs and not others
+        aspects = [rest]
+    return [subject + aspect for aspect in aspects for subject in subjects]
+
+
+def reciprocal_rank_fusion(result_lists: List[List[Dict[str, str]]],
+                           k: int = 60) -> List[Dict[str, str]]:
+    """
+    Merge ranked result lists with reciprocal rank fusion
+
+    Args:
+        result_lists: Formatted result lists, each ordered best first
+        k: Smoothing constant (60 is the usual choice)
+
+    Returns:
+        Deduplicated results ordered by fused score
+    """
+    scores = {}
+    items = {}
+
+    for results in result_lists:
+        for rank, result in enumerate(results, 1):
+            key = result.get('link') or result.get('title', '')
+            if not key:
+                continue
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            items.setdefault(key, result)
+
+    ranked = sorted(scores, key=lambda key: scores[key], reverse=True)
+    return [items[key] for key in ranked]
+
+
+class QueryExpander:
+    """Splits complex queries into sub-queries and searches them concurrently"""
+
+    def __init__(self, searcher, ai=None, max_queries: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        """
+        Initialize the QueryExpander
+
+        Args:
+            searcher: Object with search()/format_results(), e.g. a SearchRegistry
+            ai: Optional GroqAI instance used for model-based expansion
+            max_queries: Maximum number of sub-queries, including the original
+                (default: QUERY_EXPANSION_MAX or 4)
+            timeout: Wall-clock deadline in seconds for all sub-searches
+                (default: QUERY_EXPANSION_TIMEOUT or 8)
+        """
+        self.searcher = searcher
+        self.ai = ai
+        self.max_queries = max_queries or int(os.getenv('QUERY_EXPANSION_MAX', '4'))
+        self.timeout = timeout or float(os.getenv('QUERY_EXPANSION_TIMEOUT', '8'))
+
+    def expand(self, query: str, timeout: Optional[float] = None) -> List[str]:
+        """
+        Decompose a query into sub-queries
+
+        Uses the AI model when one was provided, otherwise local heuristics.
+        The original query is always searched first.
+
+        Args:
+            query: User's search query
+            timeout: Seconds allowed for the model call (default: client timeout)
+
+        Returns:
+            List of unique sub-queries
+        """
+        if self.ai is not None:
+            candidates = self.ai.generate_sub_queries(query, self.max_queries - 1,
+                                                      timeout=timeout)
+        else:
+            candidates = self._heuristic_sub_queries(query)
+
+        sub_queries = [query]
+        seen = {query.lower()}
+        for candidate in candidates:
+            candidate = candidate.strip()
+            if candidate and candidate.lower() not in seen:
+                seen.add(candidate.lower())
+                sub_queries.append(candidate)
+
+        return sub_queries[:self.max_queries]
+
+    def _heuristic_sub_queries(self, query: str) -> List[str]:
+        """
+        Build one sub-query per facet, carrying the shared context into each
+
+        "python vs java performance and memory usage" becomes "python
+        performance", "java performance", "python memory usage", ... When
+        the facets are not clearly parallel, or there are more than fit in
+        max_queries, no sub-queries are produced and the query costs a
+        single search.
+
+        Args:
+            query: User's search query
+
+        Returns:
+            Candidate sub-queries (may contain duplicates)
+        """
+        text = query.strip().rstrip('?!.')
+        limit = self.max_queries - 1
+
+        compare_parts = _split_words(COMPARE_SPLIT, text)
+        if len(compare_parts) > 1 and len(compare_parts[0]) <= len(compare_parts[-1]):
+            # "A vs B <aspects>": subjects lead, shared aspects trail
+            facets = _split_comparison(compare_parts, limit)
+        else:
+            facets = _distribute_context(_split_words(FACET_SPLIT, text))
+            if len(facets) > limit:
+                facets = []
+
+        # Drop facets made only of filler words
+        return [' '.join(f) for f in facets
+                if any(w.lower() not in STOPWORDS for w in f)]
+
+    def search(self, query: str, num_results: int = 10,
+               timeout: Optional[float] = None) -> Dict:
+        """
+        Search all sub-queries in parallel and fuse their results
+
+        Sub-searches still running at the deadline are abandoned, so latency
+        is bounded by the timeout rather than the sum of the searches. They
+        are told to stop failing over and to leave backend health alone, but
+        a request already in flight finishes in the background (it is
+        bounded by its own timeout).
+
+        Args:
+            query: User's search query
+            num_results: Number of fused results to return (default: 10)
+            timeout: Deadline in seconds, capped at the configured timeout
+
+        Returns:
+            Dictionary with fused 'organic' results and the 'sub_queries' used
+        """
+        timeout = min(self.timeout, timeout) if timeout is not None else self.timeout
+        deadline = time.monotonic() + timeout
+
+        # Expansion may use at most a quarter of the budget
+        sub_queries = self.expand(query, timeout=timeout / 4)
+        timeout = max(0.0, deadline - time.monotonic())
+
+        # Sub-searches share one cancel event and one failure scope, so a flaky
+        # backend counts as failing once per expanded query, not once per sub-query
+        cancel = threading.Event()
+        failure_scope = set()
+        executor = ThreadPoolExecutor(max_workers=len(sub_queries))
+        futures = {executor.submit(self.searcher.search, q, num_results, timeout=timeout,
+                                   cancel=cancel, failure_scope=failure_scope): q
+                   for q in sub_queries}
+        done, pending = wait(futures, timeout=timeout)
+        cancel.set()
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+        result_lists = []
+        completed = []
+        backends = []
+        errors = []
+        for future in futures:
+            if future not in done:
+                continue
+            try:
+                raw_results = future.result()
+            except Exception as e:
+                raw_results = {'error': str(e), 'organic': []}
+            if 'error' in raw_results:
+                errors.append(raw_results['error'])
+                continue
+            result_lists.append(self.searcher.format_results(raw_results))
+            completed.append(futures[future])
+            if raw_results.get('backend') and raw_results['backend'] not in backends:
+                backends.append(raw_results['backend'])
+
+        fused = reciprocal_rank_fusion(result_lists)[:num_results]
+        if not fused:
+            return {
+                'error': '; '.join(errors) or 'Sub-searches timed out',
+                'organic': [],
+                'sub_queries': sub_queries
+            }
+
+        return {
+            'organic': fused,
+            'sub_queries': completed,
+            'backend': ','.join(backends) or None
+        }
+
+    def format_results(self, search_results: Dict) -> List[Dict[str, str]]:
+        """
+        Format fused search results into a clean structure
+
+        Args:
+            search_results: Results from search()
+
+        Returns:
+            List of formatted search results
+        """
+        formatted_results = []
+
+        # Check if there's an error
+        if 'error' in search_results:
+            return [{
+                'title': 'Search Error',
+                'snippet': search_results['error'],
+                'link': ''
+            }]
+
+        for result in search_results.get('organic', []):
+            formatted_results.append({
+                'title': result.get('title', 'No title'),
+                'snippet': result.get('snippet', 'No description available'),
+                'link': result.get('link', '')
+            })
+
+        return formatted_results
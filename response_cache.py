@@ -0,0 +1,72 @@
+"""
+Server-side response cache and ETag helpers for /api/search
+"""
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def compute_etag(*parts: Any) -> str:
+    """
+    Compute a stable validation token from JSON-serializable parts
+
+    Callers pass the content that decides whether an answer changed (the
+    request options and the result links), not the generated summary.
+
+    Args:
+        parts: Values identifying the answer
+
+    Returns:
+        Hex digest identifying the parts
+    """
+    body = json.dumps(parts, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()[:32]
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of search responses with a time-to-live"""
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 256):
+        """
+        Initialize the cache
+
+        Args:
+            ttl: Seconds a response stays fresh
+            max_entries: Maximum number of responses kept
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[Tuple[str, Dict]]:
+        """
+        Look up a fresh response
+
+        Args:
+            key: Cache key for the request
+
+        Returns:
+            (etag, payload) tuple, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, etag, payload = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return etag, payload
+
+    def put(self, key: Tuple, etag: str, payload: Dict):
+        """Store a response, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), etag, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
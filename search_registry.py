@@ -0,0 +1,346 @@
+"""
+Search backend registry with health-scored automatic failover
+"""
+import os
+import time
+import importlib
+import threading
+from collections import deque
+from typing import List, Dict, Optional
+
+
+# Known backends: name -> (module, environment variable holding its API key)
+BACKENDS = {
+    'duckduckgo': ('web_search_duckduckgo', None),
+    'serper': ('web_search', 'SERPER_API_KEY'),
+    'brave': ('web_search_brave', 'BRAVE_API_KEY'),
+}
+
+DEFAULT_BACKENDS = 'duckduckgo,serper,brave'
+
+# Smallest timeout given to one backend attempt when a deadline is split
+MIN_ATTEMPT_SECONDS = 2.0
+
+
+class BackendHealth:
+    """Tracks rolling latency/error statistics and a circuit breaker for one backend"""
+
+    def __init__(self, window: int = 20, failure_threshold: int = 3,
+                 cooldown: float = 30.0, min_success_rate: float = 0.5,
+                 max_age: float = 300.0):
+        """
+        Initialize the health tracker
+
+        Args:
+            window: Number of recent calls used for the rolling statistics
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown: Seconds an unhealthy backend waits before a probe call
+            min_success_rate: Success rate below which the backend is demoted
+            max_age: Seconds after which a call no longer counts in the statistics
+        """
+        self.min_success_rate = min_success_rate
+        self.max_age = max_age
+        # (timestamp, latency, succeeded) for recent calls
+        self.calls = deque(maxlen=window)
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.last_attempt = None
+        self.last_error = None
+        self._lock = threading.Lock()
+
+    def record_success(self, latency: float):
+        """Record a successful call and close the circuit"""
+        with self._lock:
+            self.calls.append((time.monotonic(), latency, True))
+            self.last_attempt = time.monotonic()
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.last_error = None
+
+    def record_failure(self, latency: float, error: str):
+        """Record a failed call, opening the circuit after repeated failures"""
+        with self._lock:
+            self.calls.append((time.monotonic(), latency, False))
+            self.last_attempt = time.monotonic()
+            self.consecutive_failures += 1
+            self.last_error = error
+            if self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+    def _recent_calls(self) -> List[tuple]:
+        """Calls young enough to count; older ones age out so idle backends recover"""
+        cutoff = time.monotonic() - self.max_age
+        return [call for call in self.calls if call[0] >= cutoff]
+
+    def claim_probe(self) -> bool:
+        """
+        Claim a probe call for an unhealthy backend whose cooldown has passed
+
+        Only one caller per cooldown period gets True, so a demoted backend
+        receives a single trial call instead of a burst of traffic.
+        """
+        with self._lock:
+            if self.opened_at is None and self.success_rate() >= self.min_success_rate:
+                return False
+            since = max(self.last_attempt or 0.0, self.opened_at or 0.0)
+            if time.monotonic() - since < self.cooldown:
+                return False
+            # Counts as an attempt until the probe's outcome is recorded
+            self.last_attempt = time.monotonic()
+            return True
+
+    def is_available(self) -> bool:
+        """Return True if the circuit is closed or its cooldown has elapsed (half-open)"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            return time.monotonic() - self.opened_at >= self.cooldown
+
+    def is_healthy(self) -> bool:
+        """Return True if the circuit is closed and the success rate is acceptable"""
+        with self._lock:
+            return self.opened_at is None and self.success_rate() >= self.min_success_rate
+
+    def success_rate(self) -> float:
+        """Fraction of successful recent calls (1.0 when there are none)"""
+        calls = self._recent_calls()
+        if not calls:
+            return 1.0
+        return sum(1 for call in calls if call[2]) / len(calls)
+
+    def avg_latency(self) -> float:
+        """Mean latency in seconds over recent calls (0.0 when there are none)"""
+        calls = self._recent_calls()
+        if not calls:
+            return 0.0
+        return sum(call[1] for call in calls) / len(calls)
+
+    def score(self) -> float:
+        """Health score in [0, 1]; higher is healthier"""
+        with self._lock:
+            return self.success_rate() / (1.0 + self.avg_latency())
+
+    def snapshot(self) -> Dict:
+        """Return the current statistics as a dictionary"""
+        with self._lock:
+            return {
+                'score': round(self.success_rate() / (1.0 + self.avg_latency()), 3),
+                'success_rate': round(self.success_rate(), 3),
+                'avg_latency': round(self.avg_latency(), 3),
+                'consecutive_failures': self.consecutive_failures,
+                'circuit_open': self.opened_at is not None,
+                'last_error': self.last_error
+            }
+
+
+class SearchRegistry:
+    """Routes each query to the highest-priority healthy search backend"""
+
+    def __init__(self, backends: Optional[List[str]] = None):
+        """
+        Initialize the registry from configuration
+
+        Args:
+            backends: Backend names in priority order. Defaults to the
+                comma-separated SEARCH_BACKENDS environment variable.
+        """
+        if backends is None:
+            backends = os.getenv('SEARCH_BACKENDS', DEFAULT_BACKENDS).split(',')
+
+        failure_threshold = int(os.getenv('SEARCH_FAILURE_THRESHOLD', '3'))
+        cooldown = float(os.getenv('SEARCH_COOLDOWN_SECONDS', '30'))
+        min_success_rate = float(os.getenv('SEARCH_MIN_SUCCESS_RATE', '0.5'))
+        max_age = float(os.getenv('SEARCH_HEALTH_WINDOW_SECONDS', '300'))
+
+        # Concurrent calls allowed per backend (protects scraped backends from bursts)
+        max_concurrency = int(os.getenv('SEARCH_MAX_CONCURRENCY', '2'))
+
+        self.searchers = {}
+        self.health = {}
+        self.slots = {}
+        self._scope_lock = threading.Lock()
+        for name in [b.strip().lower() for b in backends if b.strip()]:
+            searcher = self._load_backend(name)
+            if searcher is not None:
+                self.searchers[name] = searcher
+                self.health[name] = BackendHealth(failure_threshold=failure_threshold,
+                                                  cooldown=cooldown,
+                                                  min_success_rate=min_success_rate,
+                                                  max_age=max_age)
+                self.slots[name] = threading.Semaphore(max_concurrency)
+        self.order = list(self.searchers)
+
+        if not self.searchers:
+            raise ValueError("No search backends available. Check SEARCH_BACKENDS.")
+
+    def _load_backend(self, name: str):
+        """
+        Import and construct the WebSearcher for a backend
+
+        Args:
+            name: Backend name from BACKENDS
+
+        Returns:
+            WebSearcher instance, or None if it cannot be used
+        """
+        if name not in BACKENDS:
+            print(f"Warning: Unknown search backend '{name}'")
+            return None
+
+        module_name, key_env = BACKENDS[name]
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            print(f"Warning: Search backend '{name}' unavailable: {e}")
+            return None
+
+        if key_env:
+            api_key = os.getenv(key_env)
+            if not api_key:
+                return None
+            return module.WebSearcher(api_key)
+        return module.WebSearcher()
+
+    def ranked_backends(self) -> List[str]:
+        """
+        Return backends in the order they should be tried
+
+        An unhealthy backend whose cooldown has passed goes first for a single
+        probe call, so it can win back its priority slot. Healthy backends
+        follow in the configured priority order, then demoted ones (low
+        success rate, or a circuit past its cooldown), best score first. If
+        every circuit is open, the backend closest to the end of its
+        cooldown is still tried rather than failing outright.
+        """
+        probes = []
+        healthy = []
+        demoted = []
+        for name in self.order:
+            if self.health[name].claim_probe():
+                probes.append(name)
+            elif self.health[name].is_healthy():
+                healthy.append(name)
+            elif self.health[name].is_available():
+                demoted.append(name)
+        demoted.sort(key=lambda name: -self.health[name].score())
+
+        ranked = probes + healthy + demoted
+        if not ranked:
+            ranked = [min(self.order, key=lambda name: self.health[name].opened_at or 0)]
+        return ranked
+
+    def search(self, query: str, num_results: int = 10,
+               timeout: Optional[float] = None,
+               cancel: Optional[threading.Event] = None,
+               failure_scope: Optional[set] = None) -> Dict:
+        """
+        Search with the healthiest backend, failing over to the next on error
+
+        With a timeout, each attempt gets an equal share of the time left for
+        the backends still to try (at least MIN_ATTEMPT_SECONDS), so one
+        stalled backend cannot use up the budget meant for failover.
+
+        Args:
+            query: Search query string
+            num_results: Number of results to retrieve (default: 10)
+            timeout: Total seconds allowed across all attempts (default: each
+                backend's own timeout)
+            cancel: Event set by a caller that no longer wants the result.
+                No further backends are tried and no health is recorded once
+                it is set; an HTTP request already in flight still runs until
+                its own timeout.
+            failure_scope: Set shared by related searches (e.g. the sub-searches
+                of one expanded query) so each backend has at most one failure
+                recorded for all of them.
+
+        Returns:
+            Dictionary containing search results and the 'backend' that served them
+        """
+        errors = []
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        ranked = self.ranked_backends()
+
+        for position, name in enumerate(ranked):
+            if cancel is not None and cancel.is_set():
+                errors.append('cancelled')
+                break
+
+            kwargs = {}
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    errors.append('deadline exceeded')
+                    break
+                share = remaining / (len(ranked) - position)
+                kwargs['timeout'] = min(remaining, max(share, MIN_ATTEMPT_SECONDS))
+
+            # Wait for a free slot on this backend, within the attempt's budget
+            if not self.slots[name].acquire(timeout=kwargs.get('timeout')):
+                errors.append(f"{name}: busy")
+                continue
+
+            start = time.monotonic()
+            try:
+                raw_results = self.searchers[name].search(query, num_results, **kwargs)
+            except Exception as e:
+                raw_results = {'error': str(e), 'organic': []}
+            finally:
+                self.slots[name].release()
+            latency = time.monotonic() - start
+
+            if cancel is not None and cancel.is_set():
+                # The caller has moved on; this outcome says nothing useful
+                errors.append('cancelled')
+                break
+
+            if 'error' in raw_results and deadline is not None and time.monotonic() >= deadline:
+                # The caller's budget ran out; not the backend's fault
+                errors.append(f"{name}: deadline exceeded")
+                break
+
+            if 'error' in raw_results:
+                error = raw_results['error']
+            elif not raw_results.get('organic'):
+                error = 'No results parsed'
+            else:
+                self.health[name].record_success(latency)
+                raw_results['backend'] = name
+                return raw_results
+
+            if self._claim_failure(name, failure_scope):
+                self.health[name].record_failure(latency, error)
+            errors.append(f"{name}: {error}")
+
+        return {
+            'error': 'All search backends failed (' + '; '.join(errors) + ')',
+            'organic': []
+        }
+
+    def _claim_failure(self, name: str, failure_scope: Optional[set]) -> bool:
+        """Return True if a failure of this backend should be recorded in this scope"""
+        if failure_scope is None:
+            return True
+        with self._scope_lock:
+            if name in failure_scope:
+                return False
+            failure_scope.add(name)
+            return True
+
+    def format_results(self, search_results: Dict) -> List[Dict[str, str]]:
+        """
+        Format search results using the backend that produced them
+
+        Args:
+            search_results: Raw search results from search()
+
+        Returns:
+            List of formatted search results
+        """
+        name = search_results.get('backend', self.order[0])
+        return self.searchers[name].format_results(search_results)
+
+    def status(self) -> Dict[str, Dict]:
+        """Return health statistics for every configured backend"""
+        return {name: self.health[name].snapshot() for name in self.order}
@@ -141,17 +141,213 @@ function animateLoadingSteps() {
     });
 }
 
+// ==================== 
+// Result Cache (IndexedDB)
+// ====================
+
+const resultCache = {
+    dbName: 'web-search-agent',
+    storeName: 'results',
+    maxEntries: 50,
+    maxBytes: 5 * 1024 * 1024,
+    // Entries younger than this are shown without asking the server
+    freshMs: 5 * 60 * 1000,
+    dbPromise: null,
+    
+    open() {
+        if (!this.dbPromise) {
+            this.dbPromise = new Promise((resolve) => {
+                // Caching is optional; without IndexedDB every search goes to the server
+                if (!window.indexedDB) {
+                    resolve(null);
+                    return;
+                }
+                
+                const request = indexedDB.open(this.dbName, 1);
+                request.onupgradeneeded = () => {
+                    const store = request.result.createObjectStore(this.storeName, { keyPath: 'key' });
+                    store.createIndex('lastAccess', 'lastAccess');
+                };
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => resolve(null);
+            });
+        }
+        return this.dbPromise;
+    },
+    
+    async get(key) {
+        const db = await this.open();
+        if (!db) return null;
+        
+        return new Promise((resolve) => {
+            const store = db.transaction(this.storeName, 'readwrite').objectStore(this.storeName);
+            const request = store.get(key);
+            request.onsuccess = () => {
+                const entry = request.result || null;
+                if (entry) {
+                    // Mark as recently used
+                    entry.lastAccess = Date.now();
+                    store.put(entry);
+                }
+                resolve(entry);
+            };
+            request.onerror = () => resolve(null);
+        });
+    },
+    
+    async put(key, data, etag) {
+        const db = await this.open();
+        if (!db) return;
+        
+        const entry = {
+            key: key,
+            data: data,
+            etag: etag,
+            size: JSON.stringify(data).length,
+            storedAt: Date.now(),
+            lastAccess: Date.now()
+        };
+        
+        await new Promise((resolve) => {
+            const transaction = db.transaction(this.storeName, 'readwrite');
+            transaction.objectStore(this.storeName).put(entry);
+            transaction.oncomplete = resolve;
+            transaction.onerror = resolve;
+            transaction.onabort = resolve;
+        });
+        await this.evict(db);
+    },
+    
+    isFresh(entry) {
+        return Date.now() - (entry.storedAt || 0) < this.freshMs;
+    },
+    
+    evict(db) {
+        return new Promise((resolve) => {
+            const transaction = db.transaction(this.storeName, 'readwrite');
+            const index = transaction.objectStore(this.storeName).index('lastAccess');
+            let count = 0;
+            let bytes = 0;
+            
+            // Walk from most to least recently used, deleting entries past the limits
+            index.openCursor(null, 'prev').onsuccess = (e) => {
+                const cursor = e.target.result;
+                if (!cursor) return;
+                
+                const size = cursor.value.size || 0;
+                if (count + 1 > this.maxEntries || bytes + size > this.maxBytes) {
+                    cursor.delete();
+                } else {
+                    count += 1;
+                    bytes += size;
+                }
+                cursor.continue();
+            };
+            transaction.oncomplete = resolve;
+            transaction.onerror = resolve;
+            transaction.onabort = resolve;
+        });
+    }
+};
+
+function cacheKey(query) {
+    // Must match the request options sent in requestSearch()
+    return `${query.trim().toLowerCase().replace(/\s+/g, ' ')}|10|true`;
+}
+
+function storeResults(key, data, response) {
+    // Degraded answers are not cached so the next visit can get a complete one
+    if (data.degraded && data.degraded.length > 0) return;
+    resultCache.put(key, data, response.headers.get('ETag'));
+}
+
 // ==================== 
 // Search Functions
 // ====================
 
-async function performSearch(query) {
+function requestSearch(query, etag = null) {
+    const headers = {
+        'Content-Type': 'application/json'
+    };
+    if (etag) {
+        headers['If-None-Match'] = etag;
+    }
+    
+    return fetch('/api/search', {
+        method: 'POST',
+        headers: headers,
+        body: JSON.stringify({
+            query: query,
+            num_results: 10,
+            filter_results: true
+        })
+    });
+}
+
+async function revalidateResults(query, key, cached) {
+    try {
+        const response = await requestSearch(query, cached.etag);
+        
+        // Cached answer is still current; restart its freshness window
+        if (response.status === 304) {
+            resultCache.put(key, cached.data, cached.etag);
+            return;
+        }
+        
+        const data = await response.json();
+        
+        // Keep the complete cached answer rather than a degraded or failed one
+        if (!data.success || (data.degraded && data.degraded.length > 0)) return;
+        
+        storeResults(key, data, response);
+        
+        // Only swap in the fresh answer if the user is still looking at this query
+        if (state.currentQuery === query && !state.isSearching &&
+            !elements.resultsSection.classList.contains('hidden')) {
+            displayResults(data);
+            showToast('Results updated');
+        }
+    } catch (error) {
+        console.error('Revalidation error:', error);
+    }
+}
+
+function pushSearchHistory(query) {
+    const url = new URL(window.location.href);
+    if (url.searchParams.get('q') === query) return;
+    
+    url.searchParams.set('q', query);
+    window.history.pushState({ query: query }, '', url);
+}
+
+async function performSearch(query, { pushHistory = true } = {}) {
     if (!query.trim()) {
         showToast('Please enter a search query');
         return;
     }
     
     state.currentQuery = query;
+    if (pushHistory) {
+        pushSearchHistory(query);
+    }
+    
+    // Render cached answers instantly; check stale ones with the server in the background
+    const key = cacheKey(query);
+    const cached = await resultCache.get(key);
+    
+    // The user may have moved to another query while the cache was read
+    if (state.currentQuery !== query) return;
+    
+    if (cached) {
+        state.isSearching = false;
+        displayResults(cached.data);
+        updateStatus('ready', 'Ready');
+        if (!resultCache.isFresh(cached)) {
+            revalidateResults(query, key, cached);
+        }
+        return;
+    }
+    
     state.isSearching = true;
     
     // Update UI
@@ -161,35 +357,42 @@ async function performSearch(query) {
     
     try {
         // Make API request
-        const response = await fetch('/api/search', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({
-                query: query,
-                num_results: 10,
-                filter_results: true
-            })
-        });
+        const response = await requestSearch(query);
         
         const data = await response.json();
         
+        // Still worth caching, but don't show it if the user has moved on
+        // (e.g. back/forward to another query while this one was loading)
+        if (state.currentQuery !== query) {
+            if (data.success) {
+                storeResults(key, data, response);
+            }
+            return;
+        }
+        
         state.isSearching = false;
         
         if (data.success) {
             // Display results
             displayResults(data);
             updateStatus('ready', 'Ready');
+            storeResults(key, data, response);
+            
+            // Let the user know if parts of the answer were degraded to meet the deadline
+            if (data.degraded && data.degraded.length > 0) {
+                showToast('Answered quickly with reduced detail: ' + data.degraded.join(', ').replace(/_/g, ' '), 5000);
+            }
         } else {
             // Show error
             showError(data.error || 'An error occurred while searching');
         }
         
     } catch (error) {
+        console.error('Search error:', error);
+        if (state.currentQuery !== query) return;
+        
         state.isSearching = false;
         showError('Network error. Please check your connection and try again.');
-        console.error('Search error:', error);
     }
 }
 
@@ -290,6 +493,10 @@ document.querySelectorAll('.example-chip').forEach(chip => {
 
 // Back button
 elements.backButton.addEventListener('click', () => {
+    // New history entry so the browser's back button returns to these results
+    window.history.pushState({}, '', window.location.pathname);
+    state.currentQuery = '';
+    state.isSearching = false;
     showSection('search');
     elements.searchInput.value = '';
     elements.searchInput.focus();
@@ -304,6 +511,20 @@ elements.retryButton.addEventListener('click', () => {
     }
 });
 
+// Browser back/forward: cached results render instantly
+window.addEventListener('popstate', (e) => {
+    const query = e.state && e.state.query;
+    if (query) {
+        elements.searchInput.value = query;
+        performSearch(query, { pushHistory: false });
+    } else {
+        // Any search still in flight is no longer wanted on screen
+        state.currentQuery = '';
+        state.isSearching = false;
+        showSection('search');
+    }
+});
+
 // Keyboard shortcuts
 document.addEventListener('keydown', (e) => {
     // Ctrl/Cmd + K to focus search
@@ -353,6 +574,14 @@ document.addEventListener('DOMContentLoaded', () => {
     // Check health
     checkHealth();
     
+    // Restore a search from the URL (shared link or page reload)
+    const initialQuery = new URLSearchParams(window.location.search).get('q');
+    if (initialQuery) {
+        window.history.replaceState({ query: initialQuery }, '', window.location.href);
+        elements.searchInput.value = initialQuery;
+        performSearch(initialQuery, { pushHistory: false });
+    }
+    
     // Add smooth scroll behavior
     document.documentElement.style.scrollBehavior = 'smooth';
     
@@ -0,0 +1,28 @@
+"""
+Tests for request deadline resolution
+"""
+import pytest
+
+from deadline import resolve_deadline
+
+
+@pytest.fixture(autouse=True)
+def deadline_env(monkeypatch):
+    monkeypatch.setenv('REQUEST_DEADLINE_SECONDS', '20')
+    monkeypatch.setenv('MAX_REQUEST_DEADLINE_SECONDS', '30')
+
+
+@pytest.mark.parametrize('requested, expected', [
+    (None, 20.0),
+    (5, 5.0),
+    (0, 20.0),
+    (100, 30.0),
+])
+def test_resolve_deadline(requested, expected):
+    assert resolve_deadline(requested) == expected
+
+
+@pytest.mark.parametrize('requested', [float('nan'), float('inf'), True, False, [5], 'soon'])
+def test_resolve_deadline_rejects_invalid_values(requested):
+    with pytest.raises((TypeError, ValueError)):
+        resolve_deadline(requested)
@@ -0,0 +1,71 @@
+"""
+Tests for the query expansion heuristics and result fusion
+"""
+import pytest
+
+from query_expansion import QueryExpander, _distribute_context, reciprocal_rank_fusion
+
+
+def words(text):
+    return text.split()
+
+
+@pytest.mark.parametrize('parts, expected', [
+    (['AI regulation in EU', 'US', 'China'],
+     ['AI regulation in EU', 'AI regulation in US', 'AI regulation in China']),
+    (['cats', 'dogs as pets'], ['cats as pets', 'dogs as pets']),
+    (['restaurants in New York', 'London'], ['restaurants in New York', 'restaurants in London']),
+])
+def test_distribute_context_parallel_items(parts, expected):
+    facets = _distribute_context([words(p) for p in parts])
+    assert [' '.join(f) for f in facets] == expected
+
+
+@pytest.mark.parametrize('parts', [
+    ['What is the difference between TCP', 'UDP'],
+    ['How do I install', 'configure nginx on Ubuntu'],
+    ['rock', 'roll history'],
+    ['single segment'],
+])
+def test_distribute_context_rejects_non_parallel(parts):
+    assert _distribute_context([words(p) for p in parts]) == []
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('python vs java performance and memory usage',
+     ['python performance and memory usage', 'java performance and memory usage']),
+    ('New York vs London cost of living',
+     ['New York cost of living', 'London cost of living']),
+    ('latest news about AI regulation in EU and US, compared with China',
+     ['latest news about AI regulation in EU', 'latest news about AI regulation in US',
+      'latest news about AI regulation in China']),
+    ('What is the capital of France?', []),
+    ('What is the difference between TCP and UDP?', []),
+    ('How do I install and configure nginx on Ubuntu', []),
+    ('rock and roll history', []),
+])
+def test_heuristic_sub_queries(query, expected):
+    assert QueryExpander(None, max_queries=4)._heuristic_sub_queries(query) == expected
+
+
+def test_heuristic_sub_queries_covers_every_pair_when_they_fit():
+    expander = QueryExpander(None, max_queries=5)
+    assert expander._heuristic_sub_queries('python vs java performance and memory usage') == [
+        'python performance', 'java performance', 'python memory usage', 'java memory usage'
+    ]
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    a = {'title': 'A', 'link': 'https://a'}
+    b = {'title': 'B', 'link': 'https://b'}
+    c = {'title': 'C', 'link': 'https://c'}
+    fused = reciprocal_rank_fusion([[a, b], [c, b], [b]])
+    assert [r['link'] for r in fused] == ['https://b', 'https://a', 'https://c']
+
+
+def test_reciprocal_rank_fusion_deduplicates_and_skips_empty_keys():
+    first = {'title': 'A', 'link': 'https://a', 'snippet': 'first'}
+    again = {'title': 'A', 'link': 'https://a', 'snippet': 'second'}
+    blank = {'title': '', 'link': ''}
+    fused = reciprocal_rank_fusion([[first, blank], [again]])
+    assert fused == [first]
@@ -5,14 +5,27 @@ from flask import Flask, render_template, request, jsonify
 from flask_cors import CORS
 import os
 from dotenv import load_dotenv
-from web_search import WebSearcher
+from search_registry import SearchRegistry
+from query_expansion import QueryExpander
 from groq_ai import GroqAI
+from deadline import (Deadline, SummaryCache, resolve_deadline, filter_with_fallback,
+                      summarize_with_fallback, SEARCH_SHARE)
+from response_cache import ResponseCache, compute_etag
 
 # Load environment variables
 load_dotenv()
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=['ETag'])
+
+# Last good summaries, used when a request runs out of time
+summary_cache = SummaryCache()
+
+# Recent complete answers by request, so repeat queries skip the whole pipeline
+response_cache = ResponseCache(ttl=float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '300')))
+
+# Complete answers by ETag, so unchanged search results reuse their summary
+answer_cache = ResponseCache(ttl=float(os.getenv('ANSWER_CACHE_TTL_SECONDS', '86400')))
 
 # Initialize components
 try:
@@ -22,21 +35,20 @@ try:
         print("Warning: GROQ_API_KEY not found in environment variables")
         searcher = None
         ai = None
+        expander = None
     else:
-        serper_api_key = os.getenv('SERPER_API_KEY')
-        if not serper_api_key:
-            print("Warning: SERPER_API_KEY not found in environment variables")
-            searcher = None
-            ai = None
-        else:
-            searcher = WebSearcher(serper_api_key)
-            ai = GroqAI(groq_api_key)
-            print("✓ Web Search Agent initialized successfully!")
-            print("✓ Using Serper.dev for web search")
+        searcher = SearchRegistry()
+        ai = GroqAI(groq_api_key)
+        # QUERY_EXPANSION=llm uses a small model instead of local heuristics
+        use_llm = os.getenv('QUERY_EXPANSION', 'heuristic').lower() == 'llm'
+        expander = QueryExpander(searcher, ai if use_llm else None)
+        print("✓ Web Search Agent initialized successfully!")
+        print(f"✓ Search backends: {', '.join(searcher.order)}")
 except Exception as e:
     print(f"Error initializing agent: {e}")
     searcher = None
     ai = None
+    expander = None
 
 
 @app.route('/')
@@ -45,6 +57,16 @@ def index():
     return render_template('index.html')
 
 
+def _conditional_response(payload: dict, etag: str):
+    """Return 304 if the client already holds this ETag, otherwise the JSON payload"""
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(payload)
+    response.set_etag(etag)
+    return response
+
+
 @app.route('/api/search', methods=['POST'])
 def search():
     """Handle search requests"""
@@ -66,34 +88,85 @@ def search():
                 'error': 'Please enter a search query'
             }), 400
         
-        # Perform web search
+        # Client-specified deadline in seconds, capped by the server
+        try:
+            deadline = Deadline(resolve_deadline(data.get('deadline')))
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': 'deadline must be a number of seconds'
+            }), 400
+        degradations = []
+        
+        # Serve recent identical requests from the response cache
         num_results = data.get('num_results', 10)
-        raw_results = searcher.search(query, num_results)
-        search_results = searcher.format_results(raw_results)
+        filter_results = data.get('filter_results', True)
+        expand_query = data.get('expand_query', False)
+        cache_key = (' '.join(query.lower().split()), num_results, filter_results, expand_query)
+        cached = response_cache.get(cache_key)
+        if cached:
+            etag, payload = cached
+            return _conditional_response(payload, etag)
+        
+        # Perform web search
+        active_searcher = expander if expand_query else searcher
+        raw_results = active_searcher.search(query, num_results,
+                                             timeout=deadline.budget(SEARCH_SHARE))
+        search_results = active_searcher.format_results(raw_results)
         
         if not search_results or 'error' in raw_results:
+            if deadline.expired():
+                return jsonify({
+                    'success': False,
+                    'error': 'Search timed out. Please try again.'
+                }), 504
             return jsonify({
                 'success': False,
                 'error': 'Failed to fetch search results. Please try again.'
-            }), 500
+            }), 503
         
-        # Filter results with AI
-        filter_results = data.get('filter_results', True)
+        # The validator covers the request and the results found, not the generated
+        # summary, so an unchanged result set revalidates without any AI calls
+        etag = compute_etag(cache_key, sorted(r['link'] for r in search_results))
+        if request.if_none_match.contains(etag):
+            return _conditional_response({}, etag)
+        
+        stored = answer_cache.get(etag)
+        if stored:
+            payload = stored[1]
+            response_cache.put(cache_key, etag, payload)
+            return _conditional_response(payload, etag)
+        
+        # Filter results with AI, keeping the top results if it fails or time is short
         if filter_results and len(search_results) > 5:
-            filtered_results = ai.filter_relevant_results(query, search_results, top_n=5)
+            filtered_results = filter_with_fallback(ai, query, search_results,
+                                                    deadline, degradations)
         else:
             filtered_results = search_results[:5]
         
-        # Generate AI summary
-        summary = ai.summarize_results(query, filtered_results)
+        # Generate AI summary, degrading to cached/extractive/no summary
+        summary = summarize_with_fallback(ai, query, filtered_results, deadline,
+                                          summary_cache, degradations)
         
-        return jsonify({
+        payload = {
             'success': True,
             'query': query,
             'summary': summary,
             'results': filtered_results,
-            'total_results': len(search_results)
-        })
+            'total_results': len(search_results),
+            'backend': raw_results.get('backend'),
+            'sub_queries': raw_results.get('sub_queries', [query]),
+            'degraded': degradations
+        }
+        
+        # Degraded answers are neither cached nor validated, so a later request can do better
+        if degradations:
+            return jsonify(payload)
+        
+        response_cache.put(cache_key, etag, payload)
+        answer_cache.put(etag, etag, payload)
+        
+        return _conditional_response(payload, etag)
     
     except Exception as e:
         return jsonify({
@@ -107,7 +180,8 @@ def health():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'agent_initialized': searcher is not None and ai is not None
+        'agent_initialized': searcher is not None and ai is not None,
+        'backends': searcher.status() if searcher else {}
     })
 
 
@@ -19,13 +19,14 @@ class WebSearcher:
         self.api_key = api_key
         self.base_url = "https://google.serper.dev/search"
     
-    def search(self, query: str, num_results: int = 10) -> Dict:
+    def search(self, query: str, num_results: int = 10, timeout: float = 10) -> Dict:
         """
         Perform a web search
         
         Args:
             query: Search query string
             num_results: Number of results to retrieve (default: 10)
+            timeout: Request timeout in seconds (default: 10)
             
         Returns:
             Dictionary containing search results
@@ -41,7 +42,7 @@ class WebSearcher:
         }
         
         try:
-            response = requests.post(self.base_url, json=payload, headers=headers)
+            response = requests.post(self.base_url, json=payload, headers=headers, timeout=timeout)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
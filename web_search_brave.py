@@ -1,23 +1,26 @@
 """
-Web search module using Brave Search API (no API key required for basic use)
+Web search module using Brave Search API (requires a subscription token)
 """
 import requests
 from typing import List, Dict
 
 class WebSearcher:
     """Handles web search operations using Brave Search API"""
-    def __init__(self):
+    def __init__(self, api_key: str):
         self.base_url = "https://api.search.brave.com/res/v1/web/search"
         self.headers = {
             'User-Agent': 'Mozilla/5.0',
+            'Accept': 'application/json',
+            'X-Subscription-Token': api_key
         }
 
-    def search(self, query: str, num_results: int = 10) -> Dict:
+    def search(self, query: str, num_results: int = 10, timeout: float = 10) -> Dict:
         """
         Perform a web search using Brave Search API
         Args:
             query: Search query string
             num_results: Number of results to retrieve (default: 10)
+            timeout: Request timeout in seconds (default: 10)
         Returns:
             Dictionary containing search results
         """
@@ -26,8 +29,8 @@ class WebSearcher:
                 'q': query,
                 'count': num_results
             }
-            url = f"https://api.search.brave.com/res/v1/web/search?q={query}&count={num_results}"
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = requests.get(self.base_url, params=params, headers=self.headers,
+                                    timeout=timeout)
             response.raise_for_status()
             data = response.json()
             results = []
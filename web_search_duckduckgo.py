@@ -16,14 +16,14 @@ class WebSearcher:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
     
-    def search(self, query: str, num_results: int = 10) -> Dict:
+    def search(self, query: str, num_results: int = 10, timeout: float = 10) -> Dict:
         """
         Perform a web search using DuckDuckGo Lite (less likely to block bots)
         """
         try:
             encoded_query = urllib.parse.quote(query)
             url = f"https://lite.duckduckgo.com/lite/?q={encoded_query}"
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = requests.get(url, headers=self.headers, timeout=timeout)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
             results = []